@@ -1,25 +1,49 @@
+import os
+
+if os.getenv("GEVENT_PATCH") == "1":
+    from gevent import monkey
+    monkey.patch_all()
+
+import hashlib
 import json
 import logging
-import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
-import requests
-from flask import Flask, request, jsonify
+import numpy as np
+import httpx
+import orjson
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-from langchain.agents import AgentType, Tool, initialize_agent
-from langchain.memory import ConversationBufferMemory
-from langchain.prompts import PromptTemplate
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.chains import LLMChain
+from langchain.prompts import ChatPromptTemplate
+from langchain_core.embeddings import Embeddings
 from langchain_google_genai import ChatGoogleGenerativeAI
+from numba import njit
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app, resources={
     r"/generate-post": {
         "origins": ["http://localhost:3000"],
@@ -28,6 +52,22 @@ CORS(app, resources={
     }
 })
 
+def create_http_client() -> httpx.Client:
+    """Create a pooled HTTP/2 client shared by outbound calls"""
+    transport = httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        retries=2
+    )
+    return httpx.Client(transport=transport, timeout=10.0)
+
+HTTP = create_http_client()
+
+SEARCH_CACHE_TTL = 3600
+SEARCH_CACHE_MAX_SIZE = 1024
+_search_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
 def setup_logging() -> None:
     """Configure logging settings"""
     logging.basicConfig(
@@ -41,11 +81,22 @@ def load_environment() -> None:
     load_dotenv()
     if not os.getenv("GOOGLE_API_KEY"):
         raise EnvironmentError("Please set GOOGLE_API_KEY in your environment variables")
-    
+
+load_environment()
+
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# REST rather than the default gRPC transport: gRPC blocks the gevent hub and is not fork-safe
+LLM = ChatGoogleGenerativeAI(
+    temperature=0.7,
+    model="gemini-1.5-flash-002",
+    google_api_key=GOOGLE_API_KEY,
+    transport="rest"
+)
+
 class ReformatTool:
     """Tool for reformatting text"""
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(temperature=0.7, model="gemini-1.5-flash-002", google_api_key=os.getenv("GOOGLE_API_KEY"))
+    def __init__(self, llm: ChatGoogleGenerativeAI = LLM):
+        self.llm = llm
 
     def reformat(self, text: str) -> str:
         """Reformat text"""
@@ -59,15 +110,31 @@ class WebSearchTool:
 
     def _run(self, query: str) -> str:
         """Run web search query with error handling."""
+        with _search_cache_lock:
+            cached = _search_cache.get(query)
+            if cached and time.monotonic() - cached[1] < SEARCH_CACHE_TTL:
+                _search_cache.move_to_end(query)
+                return cached[0]
+            if cached:
+                del _search_cache[query]
+
         try:
-            response = requests.get(
-                f"https://api.duckduckgo.com/?q={query}&format=json",
-                timeout=10
+            response = HTTP.get(
+                "https://api.duckduckgo.com/",
+                params={"q": query, "format": "json"}
             )
             response.raise_for_status()
             data = response.json()
-            return data.get("AbstractText") or self._fallback_search(query)
-        except (requests.RequestException, json.JSONDecodeError, KeyError) as e:
+            abstract = data.get("AbstractText")
+            if not abstract:
+                return self._fallback_search(query)
+            with _search_cache_lock:
+                _search_cache[query] = (abstract, time.monotonic())
+                _search_cache.move_to_end(query)
+                if len(_search_cache) > SEARCH_CACHE_MAX_SIZE:
+                    _search_cache.popitem(last=False)
+            return abstract
+        except (httpx.HTTPError, json.JSONDecodeError, KeyError) as e:
             logging.error("Web search error: %s", str(e))
             return self._fallback_search(query)
 
@@ -79,7 +146,7 @@ class WebSearchTool:
         """Fallback method when primary search fails."""
         try:
             return "Unable to fetch latest information. Using cached data instead."
-        except (requests.RequestException, json.JSONDecodeError, KeyError) as e:
+        except (httpx.HTTPError, json.JSONDecodeError, KeyError) as e:
             logging.error("Fallback search error: %s", str(e))
             return "Search functionality temporarily unavailable."
 
@@ -87,22 +154,166 @@ class WebSearchTool:
         """Public interface for web search."""
         return self._run(query)
 
+class CachedEmbeddings(Embeddings):
+    """HuggingFace embeddings with batched encoding and an on-disk per-text vector cache"""
+    def __init__(
+        self,
+        model_name: str,
+        encode_kwargs: Optional[dict] = None,
+        cache_dir: Path = Path("embedding_cache"),
+        batch_size: int = 32
+    ):
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+        self.model = HuggingFaceEmbeddings(model_name=model_name, encode_kwargs=encode_kwargs or {})
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+
+    def _cache_path(self, text: str) -> Path:
+        """Return the cache file for a text under the current model settings"""
+        normalize = self.model.encode_kwargs.get("normalize_embeddings", False)
+        key = f"{self.model.model_name}\n{normalize}\nnewlines-as-spaces\n{text}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.npy"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, only running the model for texts not seen before"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        paths = [self._cache_path(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing = []
+        for i, path in enumerate(paths):
+            if path.exists():
+                vectors[i] = np.load(path, mmap_mode="r")
+            else:
+                missing.append(i)
+
+        if missing:
+            encoded = self.model.client.encode(
+                [texts[i].replace("\n", " ") for i in missing],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                **self.model.encode_kwargs
+            ).astype("float32")
+            for i, vector in zip(missing, encoded):
+                self._save_vector(paths[i], vector)
+                vectors[i] = vector
+            logging.info("Embedded %d new texts, %d served from cache", len(missing), len(texts) - len(missing))
+
+        return np.asarray(vectors, dtype="float32").tolist()
+
+    @staticmethod
+    def _save_vector(path: Path, vector: np.ndarray) -> None:
+        """Write a vector to a temp file and rename it into place so readers never see a partial file"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, vector)
+        os.replace(tmp_path, path)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, bypassing the document cache"""
+        return self.model.embed_query(text)
+
 class VectorDB:
     """Vector database management"""
-    def __init__(self, embeddings: HuggingFaceEmbeddings):
+    hnsw_m = 32
+    ef_construction = 64
+    ef_search = 32
+
+    def __init__(self, embeddings: Embeddings, cache_dir: Path = Path("faiss_cache")):
         self.embeddings = embeddings
+        self.cache_dir = cache_dir
         self.db = None
 
     def initialize(self, texts_file: Optional[Path] = None) -> None:
-        """Initialize vector database with texts"""
+        """Initialize vector database with texts, reusing a saved index when unchanged"""
         texts = self._load_texts(texts_file) if texts_file else self._get_default_texts()
+        texts_hash = self._hash_texts(texts)
+        index_dir = self.cache_dir / texts_hash
         try:
-            self.db = FAISS.from_texts(texts, embedding=self.embeddings)
-            logging.info("Vector database initialized successfully")
+            self.db = self._load_store(index_dir) if index_dir.exists() else None
+            if self.db is None:
+                vectors = self.embeddings.embed_documents(texts)
+                self.db = self._build_store(texts, vectors)
+                self._save_store(index_dir)
+                logging.info("Vector database initialized successfully")
+            self.db.index.hnsw.efSearch = self.ef_search
+            self._prune_cache(texts_hash)
         except Exception as e:
             logging.error("Vector database initialization error: %s", str(e))
             raise
 
+    def _build_store(self, texts: List[str], vectors: List[List[float]]) -> "FAISS":
+        """Build an inner-product HNSW FAISS store over 8-bit quantized unit-length vectors"""
+        import faiss
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+        from langchain_core.documents import Document
+
+        matrix = np.asarray(vectors, dtype="float32")
+        index = faiss.IndexHNSWSQ(
+            matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, self.hnsw_m, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = self.ef_construction
+        index.train(matrix)
+        index.add(matrix)
+
+        ids = [str(i) for i in range(len(texts))]
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore({id_: Document(page_content=text) for id_, text in zip(ids, texts)}),
+            index_to_docstore_id=dict(enumerate(ids)),
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+
+    def _hash_texts(self, texts: List[str]) -> str:
+        """Hash the corpus and index settings so a change gets its own index"""
+        signature = f"hnsw{self.hnsw_m}-sq8-ip"
+        return hashlib.sha256("\n".join([signature, *sorted(texts)]).encode("utf-8")).hexdigest()
+
+    def _load_store(self, index_dir: Path) -> Optional["FAISS"]:
+        """Load a cached index, discarding it if it was built with a different index type"""
+        import faiss
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.vectorstores.utils import DistanceStrategy
+
+        db = FAISS.load_local(
+            str(index_dir),
+            self.embeddings,
+            allow_dangerous_deserialization=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+        if not isinstance(db.index, faiss.IndexHNSW):
+            logging.warning("Cached index %s is not HNSW, rebuilding", index_dir)
+            shutil.rmtree(index_dir, ignore_errors=True)
+            return None
+        logging.info("Vector database loaded from cache %s", index_dir)
+        return db
+
+    def _save_store(self, index_dir: Path) -> None:
+        """Save the index to a temp dir and rename it into place so readers never see a partial index"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir))
+        self.db.save_local(str(tmp_dir))
+        try:
+            os.replace(tmp_dir, index_dir)
+        except OSError:
+            # Another worker already published this index
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _prune_cache(self, current_hash: str) -> None:
+        """Record the active index hash and drop indexes built from older corpora"""
+        previous_file = self.cache_dir / "CURRENT"
+        if previous_file.exists():
+            previous_hash = previous_file.read_text(encoding="utf-8").strip()
+            if previous_hash and previous_hash != current_hash:
+                shutil.rmtree(self.cache_dir / previous_hash, ignore_errors=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.cache_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(current_hash)
+        os.replace(tmp_path, previous_file)
+
     def _load_texts(self, file_path: Path) -> List[str]:
         """Load texts from JSON file"""
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -118,108 +329,186 @@ class VectorDB:
             "Marketing automation and customer journey mapping with AI."
         ]
 
+POST_SYSTEM_INSTRUCTIONS = """Create a professional LinkedIn post for the topic, tone and audience given by the user, using the latest information and context provided.
+
+Content Structure:
+• Opening:
+  - Start with attention-grabbing hook using emojis and question/statistic
+  - Set up context and establish thought leadership
+  - Create urgency around the topic
+• Body:
+  - Include 3-4 data-backed statistics/insights with source citations
+  - Structure in clear 2-3 sentence paragraphs with bullet points
+  - Use industry-specific terminology matched to audience expertise level
+  - Add strategic emojis to highlight key points (2-3 per paragraph)
+  - Include real-world examples and case studies
+  - Address common pain points and solutions
+  - Incorporate trending industry keywords
+• Closing:
+  - End with compelling call-to-action
+  - Include 2 discussion questions to drive engagement
+  - Add 5-6 strategic hashtags (mix of trending/niche/branded)
+  - Provide 3 key takeaways or actionable tips
+  - Include invitation to connect/follow for more insights
+
+Formatting Guidelines:
+• Length: 1000-2000 characters optimized for LinkedIn algorithm
+• Use strategic line breaks and spacing for readability
+• Match tone precisely to audience expectations
+• Technical depth calibrated to audience expertise
+• Include numbered lists and bullet points for scalability
+• Use bold text for key phrases and statistics
+• Add relevant mentions and tags where appropriate
+
+Engagement Optimization:
+• Front-load key insights in first 2-3 lines
+• Include controversy or unique perspective to drive comments
+• Ask questions throughout to encourage interaction
+• Use power words and emotional triggers
+• Add relevant external links in first comment
+• Time post for optimal engagement window
+
+Summary:
+Create a data-driven, highly engaging post that establishes authority while driving meaningful discussion and audience growth through strategic formatting and psychology-based engagement tactics."""
+
+POST_USER_PROMPT = """Topic: {topic}
+Tone: {tone}
+Target Audience: {audience}
+Latest Information: {latest_info}
+Additional Context: {context}"""
+
+POST_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", POST_SYSTEM_INSTRUCTIONS),
+    ("human", POST_USER_PROMPT)
+])
+
+@njit(cache=True, fastmath=True)
+def similarity_scores(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Dot each row of a small embedding matrix with the query vector"""
+    n, d = matrix.shape
+    scores = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        total = np.float32(0.0)
+        for j in range(d):
+            total += matrix[i, j] * query[j]
+        scores[i] = total
+    return scores
+
+# Compile (or load from the on-disk cache) at import so no request pays for the JIT
+similarity_scores(np.zeros((1, 1), dtype="float32"), np.zeros(1, dtype="float32"))
+
+class SemanticCache:
+    """LRU cache keyed by topic embedding, matching near-duplicate topics"""
+    def __init__(self, threshold: float = 0.95, max_size: int = 256, ttl: float = SEARCH_CACHE_TTL):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self._matrix = np.empty((0, 0), dtype="float32")
+        self._keys: List[str] = []
+        self._values: List[str] = []
+        self._last_used: List[int] = []
+        self._inserted_at: List[float] = []
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(query_vector: List[float]) -> np.ndarray:
+        """L2-normalize a topic embedding so dot products are cosine similarities"""
+        vector = np.asarray(query_vector, dtype="float32")
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove(self, indexes: List[int]) -> None:
+        """Drop entries by position; caller must hold the lock"""
+        self._matrix = np.delete(self._matrix, indexes, axis=0)
+        for idx in sorted(indexes, reverse=True):
+            del self._keys[idx]
+            del self._values[idx]
+            del self._last_used[idx]
+            del self._inserted_at[idx]
+
+    def _evict_expired(self) -> None:
+        """Drop entries older than the TTL; caller must hold the lock"""
+        cutoff = time.monotonic() - self.ttl
+        expired = [i for i, inserted in enumerate(self._inserted_at) if inserted < cutoff]
+        if expired:
+            self._remove(expired)
+
+    def get(self, topic: str, query_vector: List[float]) -> Optional[str]:
+        """Return the cached value for the most similar topic above the threshold"""
+        query = self._normalize(query_vector)
+        with self._lock:
+            self._evict_expired()
+            if not self._keys:
+                return None
+            scores = similarity_scores(self._matrix, query)
+            idx = int(np.argmax(scores))
+            if scores[idx] <= self.threshold:
+                return None
+            self._clock += 1
+            self._last_used[idx] = self._clock
+            logging.info("Semantic cache hit for '%s' (matched '%s')", topic, self._keys[idx])
+            return self._values[idx]
+
+    def put(self, topic: str, query_vector: List[float], value: str) -> None:
+        """Store a value, evicting expired entries and then the least recently used one when full"""
+        vector = self._normalize(query_vector)
+        with self._lock:
+            self._evict_expired()
+            self._clock += 1
+            if self._keys:
+                self._matrix = np.vstack([self._matrix, vector])
+            else:
+                self._matrix = vector[np.newaxis, :]
+            self._keys.append(topic)
+            self._values.append(value)
+            self._last_used.append(self._clock)
+            self._inserted_at.append(time.monotonic())
+
+            if len(self._keys) > self.max_size:
+                self._remove([int(np.argmin(self._last_used))])
+
 class PostGenerator:
     """Core post generation functionality"""
     def __init__(self, llm: ChatGoogleGenerativeAI, vector_db: VectorDB):
         self.llm = llm
         self.vector_db = vector_db
-        self.prompt = self._create_prompt_template()
-
-    def generate(self, topic: str, tone: str, audience: str, latest_info: str) -> str:
-        """Generate post content"""
-        vector_results = self.vector_db.db.similarity_search(topic, k=3)
-        context = " ".join([doc.page_content for doc in vector_results])
+        self.prompt = POST_PROMPT_TEMPLATE
+        self.chain = self.prompt | self.llm
 
-        chain = LLMChain(llm=self.llm, prompt=self.prompt)
-        post_content = chain.run({
+    def stream(self, topic: str, tone: str, audience: str, latest_info: str, context: str) -> Iterator[str]:
+        """Stream post content as the model produces it"""
+        for chunk in self.chain.stream({
             "topic": topic,
             "tone": tone,
             "audience": audience,
             "latest_info": latest_info,
             "context": context
-        })
-
-        return post_content.strip()
-
-    def _create_prompt_template(self) -> PromptTemplate:
-        """Create the prompt template for post generation"""
-
-        template = """
-            Create a professional LinkedIn post following these guidelines:
-            Topic: {topic}
-            Tone: {tone}
-            Target Audience: {audience}
-            
-            Latest Information to include:
-            {latest_info}
-            
-            Additional Context:
-            {context}
-            
-            Content Structure:
-            • Opening:
-              - Start with attention-grabbing hook using emojis and question/statistic
-              - Set up context and establish thought leadership
-              - Create urgency around the topic
-            
-            • Body:
-              - Include 3-4 data-backed statistics/insights with source citations
-              - Structure in clear 2-3 sentence paragraphs with bullet points
-              - Use industry-specific terminology matched to audience expertise level
-              - Add strategic emojis to highlight key points (2-3 per paragraph)
-              - Include real-world examples and case studies
-              - Address common pain points and solutions
-              - Incorporate trending industry keywords
-            
-            • Closing:
-              - End with compelling call-to-action
-              - Include 2 discussion questions to drive engagement
-              - Add 5-6 strategic hashtags (mix of trending/niche/branded)
-              - Provide 3 key takeaways or actionable tips
-              - Include invitation to connect/follow for more insights
-            
-            Formatting Guidelines:
-            • Length: 1000-2000 characters optimized for LinkedIn algorithm
-            • Use strategic line breaks and spacing for readability
-            • Match tone precisely to audience expectations
-            • Technical depth calibrated to audience expertise
-            • Include numbered lists and bullet points for scalability
-            • Use bold text for key phrases and statistics
-            • Add relevant mentions and tags where appropriate
-            
-            Engagement Optimization:
-            • Front-load key insights in first 2-3 lines
-            • Include controversy or unique perspective to drive comments
-            • Ask questions throughout to encourage interaction
-            • Use power words and emotional triggers
-            • Add relevant external links in first comment
-            • Time post for optimal engagement window
-            
-            Summary:
-            Create a data-driven, highly engaging post that establishes authority while driving meaningful discussion and audience growth through strategic formatting and psychology-based engagement tactics.
-            """
-
-        return PromptTemplate(
-            template=template,
-            input_variables=["topic", "tone", "audience", "latest_info", "context"]
-        )
+        }):
+            if chunk.content:
+                yield chunk.content
+
+# Final output AgentExecutor returns when it stops early instead of producing an answer
+AGENT_STOPPED_OUTPUT = "Agent stopped due to iteration limit or time limit."
 
 class LinkedInPostGenerator:
     """Main application class"""
+    local_info_threshold = 0.7
+
     def __init__(self):
-        self.embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        self.llm = ChatGoogleGenerativeAI(temperature=0.7, model="gemini-1.5-flash-002", google_api_key=os.getenv("GOOGLE_API_KEY"))
-        self.memory = ConversationBufferMemory(memory_key="chat_history")
+        from langchain.agents import Tool
+
+        self.embeddings = CachedEmbeddings(
+            model_name="sentence-transformers/all-MiniLM-L6-v2",
+            encode_kwargs={"normalize_embeddings": True}
+        )
+        self.llm = LLM
         self.vector_db = VectorDB(self.embeddings)
         self.vector_db.initialize()
         self.post_generator = PostGenerator(self.llm, self.vector_db)
-        self.agent = self._setup_agent()
-
-    def _setup_agent(self) -> None:
-        """Set up LangChain agent"""
+        self.info_cache = SemanticCache()
         self.web_search_tool = WebSearchTool()
-
-        tools = [
+        self.tools = [
             Tool(
                 name="Web Search",
                 func=self.web_search_tool.search,
@@ -227,59 +516,134 @@ class LinkedInPostGenerator:
             ),
         ]
 
+    def _setup_agent(self):
+        """Set up LangChain agent with a fresh per-request memory"""
+        from langchain.agents import AgentType, initialize_agent
+        from langchain.memory import ConversationBufferMemory
+
+        memory = ConversationBufferMemory(memory_key="chat_history")
+
         return initialize_agent(
-            tools,
+            self.tools,
             self.llm,
             agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            memory=self.memory,
+            memory=memory,
             verbose=True,
             handle_parsing_errors=True,
-            max_iterations=3
+            max_iterations=2
         )
 
-    def _get_latest_info(self, topic: str) -> str:
-        """Get latest information about topic"""
+    def _search(self, query_vector: List[float]) -> List[Tuple["Document", float]]:
+        """Get the closest documents and their similarity scores from the vector database"""
+        return self.vector_db.db.similarity_search_with_score_by_vector(query_vector, k=3)
+
+    def _get_latest_info(self, topic: str, query_vector: List[float]) -> str:
+        """Get latest information about topic from the web search agent"""
         try:
-            return self.agent.run(f"Find recent updates or insights on {topic}")
+            agent = self._setup_agent()
+            latest_info = agent.run(f"Find recent updates or insights on {topic}")
+            if latest_info.strip() == AGENT_STOPPED_OUTPUT:
+                logging.warning("Agent hit its iteration limit for '%s', not caching", topic)
+            else:
+                self.info_cache.put(topic, query_vector, latest_info)
+            return latest_info
         except (ValueError, TypeError, KeyError) as e:
             logging.warning("Agent execution error: %s", str(e))
             return f"Based on industry trends and analysis, here are key insights about {topic}..."
 
-    def generate_post(self, topic: str, tone: str, audience: str) -> str:
-        """Generate LinkedIn post with error handling"""
-        try:
-            latest_info = self._get_latest_info(topic)
-            return self.post_generator.generate(topic, tone, audience, latest_info)
-        except (ValueError, TypeError, KeyError) as e:
-            logging.error("Post generation error: %s", str(e))
-            raise
-
-@app.route('/generate-post', methods=['POST', 'OPTIONS'])
+    def _gather_inputs(self, topic: str) -> Tuple[str, str]:
+        """Fetch latest information and vector context, searching the vector database once"""
+        query_vector = self.embeddings.embed_query(topic)
+        cached = self.info_cache.get(topic, query_vector)
+        docs_and_scores = self._search(query_vector)
+
+        if cached is not None:
+            return cached, " ".join([doc.page_content for doc, _ in docs_and_scores])
+
+        covered = [doc.page_content for doc, score in docs_and_scores if score >= self.local_info_threshold]
+        remaining = [doc.page_content for doc, score in docs_and_scores if score < self.local_info_threshold]
+        if covered:
+            # The corpus already covers the topic, so skip the web search and keep its documents out of the context
+            logging.info("Vector store covers '%s', skipping web search", topic)
+            return " ".join(covered), " ".join(remaining)
+
+        return self._get_latest_info(topic, query_vector), " ".join(remaining)
+
+    def stream_post(self, topic: str, tone: str, audience: str) -> Iterator[str]:
+        """Stream LinkedIn post chunks"""
+        latest_info, context = self._gather_inputs(topic)
+        yield from self.post_generator.stream(topic, tone, audience, latest_info, context)
+
+_generator: Optional[LinkedInPostGenerator] = None
+_generator_lock = threading.Lock()
+
+def get_generator() -> LinkedInPostGenerator:
+    """Return the shared generator, building it on first use"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = LinkedInPostGenerator()
+    return _generator
+
+def sse_event(payload: dict) -> str:
+    """Serialize a payload as a server-sent event"""
+    return f"data: {orjson.dumps(payload).decode('utf-8')}\n\n"
+
+SSE_SUCCESS_EVENT = sse_event({"status": "success"})
+
+@app.before_request
+def handle_preflight():
+    """Answer CORS preflight requests for known routes before the route runs"""
+    if request.method == "OPTIONS" and request.url_rule is not None:
+        return "", 204
+    return None
+
+@app.route('/generate-post', methods=['POST'])
 def generate_post():
     """API endpoint to generate LinkedIn post"""
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        return response
-
     try:
-        data = request.get_json()
+        data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return jsonify({
+            'status': 'error',
+            'message': "Request body must be valid JSON"
+        }), 400
 
-        topic = data.get('topic')
-        tone = data.get('tone') 
-        audience = data.get('audience')
+    if not isinstance(data, dict):
+        return jsonify({
+            'status': 'error',
+            'message': "Request body must be a JSON object"
+        }), 400
 
-        if not topic or not tone or not audience:
-            raise ValueError("Topic, tone, and audience are required")
+    topic = data.get('topic')
+    tone = data.get('tone')
+    audience = data.get('audience')
 
-        generator = LinkedInPostGenerator()
-        post = generator.generate_post(topic, tone, audience)
+    if not all(isinstance(value, str) and value.strip() for value in (topic, tone, audience)):
+        return jsonify({
+            'status': 'error',
+            'message': "Topic, tone, and audience are required and must be strings"
+        }), 400
 
-        response = jsonify({
-            'status': 'success',
-            'post': post
-        })
-        return response
+    try:
+        generator = get_generator()
+
+        def events() -> Iterator[str]:
+            try:
+                for chunk in generator.stream_post(topic, tone, audience):
+                    yield sse_event({"chunk": chunk})
+                yield SSE_SUCCESS_EVENT
+            except Exception as e:
+                # Headers are already sent, so every failure must surface as an error event
+                logging.exception("Post streaming error: %s", str(e))
+                yield sse_event({"status": "error", "message": str(e)})
+
+        return Response(
+            stream_with_context(events()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
 
     except (ValueError, TypeError, KeyError) as e:
         logging.error("API error: %s", str(e))
@@ -290,5 +654,6 @@ def generate_post():
 
 if __name__ == "__main__":
     setup_logging()
-    load_environment()
+    if os.getenv("FLASK_ENV") != "dev":
+        raise SystemExit("Set FLASK_ENV=dev for the development server, or run: gunicorn -c gunicorn_conf.py app:app")
     app.run(debug=True, port=8000, host='0.0.0.0')
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""Gunicorn settings for serving the API with gevent workers"""
+import multiprocessing
+
+bind = "0.0.0.0:8000"
+worker_class = "gevent"
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_connections = 1000
+timeout = 120
@@ -127,11 +127,38 @@ const Home = () => {
         body: JSON.stringify({ topic, tone, audience })
       });
 
-      const data = await response.json();
-      if (data.status === 'success' && quillRef.current) {
-        quillRef.current.root.innerHTML = formatResponse(data.post);
-      } else {
+      if (!response.headers.get('Content-Type')?.includes('text/event-stream')) {
+        const data = await response.json();
         alert('Failed to generate post: ' + data.message);
+        return;
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let post = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const event of events) {
+          if (!event.startsWith('data: ')) continue;
+          const data = JSON.parse(event.slice(6));
+
+          if (data.chunk !== undefined) {
+            post += data.chunk;
+            if (quillRef.current) {
+              quillRef.current.root.innerHTML = formatResponse(post);
+            }
+          } else if (data.status === 'error') {
+            alert('Failed to generate post: ' + data.message);
+          }
+        }
       }
     } catch (error) {
       alert('Error generating post: ' + error.message);